@@ -1,7 +1,12 @@
+import shutil
+import time
 import webbrowser
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import List, Callable
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 
 import pyperclip
@@ -10,118 +15,224 @@ from neuromation.client import AuthenticationError
 
 from neurox.client import JobDescription, StatusUpdate, NewJobUpdate, NeuroxClient
 from neurox.settings import Settings
-from neurox.utils import get_icon
+from neurox.utils import get_icon, set_new_event_loop
 from neurox.windows import Windows
 
 
 class NeuroxApp(rumps.App):
     UPDATE_DELAY = 1
+    RENDER_DELAY = 0.2
+    SAVE_DELAY = 5
+    CLOSE_TIMEOUT = 1
     MAX_UPDATE_CYCLE_LEN = 30
+    MAX_GROUP_NOTIFICATIONS = 3
+    MAX_RECENT_NOTIFICATIONS = 64
+    NOTIFICATION_WINDOW = 5
     VERSION = '1.0'
     ABOUT = f'NeuroX (version {VERSION}) by Rebryk'
     GITHUB_ULR = 'https://github.com/rebryk/neurox'
+    NO_ACTIVE_JOBS = 'No active jobs'
+    NO_PRESETS = 'No presets'
+    CLIENT_SETTINGS = ('username', 'auth', 'url', 'rsa_path')
 
     def __init__(self, *args, **kwargs):
         super().__init__('Neurox', *args, icon=get_icon('icon'), **kwargs)
         self.tmp_path = Path(f'{self._application_support}/tmp')
+        self._tmp_path_str = str(self.tmp_path.resolve())
         self.settings_path = Path(f'{self._application_support}/settings.json')
 
+        # Settings are kept in memory and flushed to disk by the update timer
+        self._settings = Settings(self.settings_path)
+        self._settings.load()
+        self._settings_dirty = False
+        self._last_save_ts = 0
+
+        # Presets are indexed by id, the order list keeps the order they are shown in
+        presets = self._settings['presets']
+        self._presets_by_id: Dict[str, dict] = {it['id']: it for it in presets}
+        self._presets_order: List[str] = [it['id'] for it in presets]
+
         self.client = NeuroxClient()
 
+        # Network requests are made in a background thread with its own event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, initializer=set_new_event_loop)
+        self._update_future: Optional[Future] = None
+        self._actions: List[Tuple[Future, str, Optional[Callable]]] = []
+
         self.iteration = 0
         self.update_cycle_len = 1
 
+        self._pending_render = False
+        self._last_render_ts = 0
+        self._menu_dirty = True
+        self._jobs_hash = None
+
+        # Time of the last notification for each (job, status, reason), used to drop repeated updates
+        self._recent_notifications = OrderedDict()  # type: OrderedDict[Tuple[str, str, str], float]
+
+        # Menu items that never change are built once and reused by every render
+        self._about_item = rumps.MenuItem(self.ABOUT, partial(self.open_url, self.GITHUB_ULR))
+        self._settings_item = self.render_settings_item()
+        self._create_job_item = rumps.MenuItem('Create job...', self.create_job)
+        self._presets_item = rumps.MenuItem('Presets')
+        self._no_jobs_item = rumps.MenuItem(self.NO_ACTIVE_JOBS)
+        self._no_presets_item = rumps.MenuItem(self.NO_PRESETS)
+        self._presets_tail: List[Tuple[str, Any]] = [
+            ('separator_presets', rumps.separator),
+            ('Create preset...', rumps.MenuItem('Create preset...', self.create_preset))
+        ]
+        self._menu_tail: List[Tuple[str, Any]] = []
+
+        # Menu items that are currently shown, so that each render only patches the difference
+        self._rendered_jobs: Dict[str, rumps.MenuItem] = dict()
+        self._rendered_presets: Dict[str, rumps.MenuItem] = dict()
+        self._job_fingerprints: Dict[str, tuple] = dict()
+        self._preset_fingerprints: Dict[str, tuple] = dict()
+        self._created_at_cache: Dict[str, datetime] = dict()
+
         self.initialize()
 
     def set_active_mode(self):
         self.update_cycle_len = 1
+        self._menu_dirty = True
 
     def initialize(self):
-        # Create a directory to store temporary files with commands
-        if not self.tmp_path.exists():
-            self.tmp_path.mkdir()
+        # Recreate an empty directory to store temporary files with commands
+        shutil.rmtree(self._tmp_path_str, ignore_errors=True)
+        self.tmp_path.mkdir(parents=True, exist_ok=True)
+
+        settings = self._settings
+
+        if not settings['username']:
+            settings['username'] = Windows.username(settings['username']).text
+            self._settings_dirty = True
+
+        if not settings['auth']:
+            settings['auth'] = Windows.auth(settings['auth']).text
+            self._settings_dirty = True
 
-        # Clear the directory
-        for file in self.tmp_path.glob('*'):
-            file.unlink()
+        if not settings['url']:
+            settings['url'] = Windows.url(settings['url']).text
+            self._settings_dirty = True
 
-        with Settings(self.settings_path) as settings:
-            if not settings['username']:
-                settings['username'] = Windows.username(settings['username']).text
+        if not settings['rsa_path']:
+            settings['rsa_path'] = Windows.rsa_path(settings['rsa_path']).text
+            self._settings_dirty = True
 
-            if not settings['auth']:
-                settings['auth'] = Windows.auth(settings['auth']).text
+        self.apply_settings(self.CLIENT_SETTINGS)
 
-            if not settings['url']:
-                settings['url'] = Windows.url(settings['url']).text
+    def save_settings(self, force: bool = False):
+        if not self._settings_dirty:
+            return
+
+        if not force and time.monotonic() - self._last_save_ts < self.SAVE_DELAY:
+            return
+
+        self._settings['presets'] = [self._presets_by_id[it] for it in self._presets_order]
+        self._settings.save()
+        self._settings_dirty = False
+        self._last_save_ts = time.monotonic()
 
-            if not settings['rsa_path']:
-                settings['rsa_path'] = Windows.rsa_path(settings['rsa_path']).text
+    def quit_application(self, sender: rumps.MenuItem):
+        self.save_settings(force=True)
 
-        self.update_client()
+        # The API session belongs to the worker's event loop, so it has to be closed there
+        closed = self._executor.submit(self.client.close)
+        self._executor.shutdown(wait=False)
+        wait([closed], timeout=self.CLOSE_TIMEOUT)
+        rumps.quit_application(sender)
+
+    def run_in_background(self, func: Callable, error_title: str, callback: Optional[Callable] = None):
+        # Show the pending icon until all background actions are finished
+        self.icon = get_icon('pending')
+        self._actions.append((self._executor.submit(func), error_title, callback))
+
+    def collect_actions(self):
+        for action in [it for it in self._actions if it[0].done()]:
+            self._actions.remove(action)
+            future, error_title, callback = action
+
+            try:
+                future.result()
+
+                if callback is not None:
+                    callback()
+            except Exception as e:
+                rumps.notification(error_title, '', str(e))
+
+            if not self._actions:
+                self.icon = get_icon('icon')
 
     def create_job(self, *args):
+        job_params = self._settings['job_params']
+        job_name = self._settings['job_name']
+
         try:
-            with Settings(self.settings_path) as settings:
-                while True:
-                    response = Windows.create_job(settings['job_params'])
-                    settings['job_params'] = str(response.text)
+            # Go back and forth between the dialogs without touching the settings
+            while True:
+                response = Windows.create_job(job_params)
+                job_params = str(response.text)
+
+                if not response.clicked:
+                    return
 
-                    if not response.clicked:
-                        return
+                response = Windows.job_description(job_name, 'Prev')
 
-                    response = Windows.job_description(settings['job_name'], 'Prev')
+                if response.clicked:
+                    job_name = response.text
+                    break
 
-                    if response.clicked:
-                        settings['job_name'] = response.text
+            self._settings['job_params'] = job_params
+            self._settings['job_name'] = job_name
+            self._settings_dirty = True
 
-                        params = f'-d \'{response.text}\' ' + settings['job_params']
-                        self.client.submit_raw(params)
-                        self.set_active_mode()
-                        return
+            params = f'-d \'{job_name}\' ' + job_params
+            self.client.submit_raw(params)
+            self.set_active_mode()
         except Exception as e:
             rumps.notification('Failed to create new job', '', str(e))
 
-    def connect_ssh(self, job: JobDescription):
+    def connect_ssh(self, job: JobDescription, *args):
         try:
-            tmp_file = str((self.tmp_path / f'{job.id}.sh').absolute())
+            tmp_file = f'{self._tmp_path_str}/{job.id}.sh'
             self.client.connect_ssh(job.id, tmp_file)
         except Exception as e:
             rumps.notification('SSH connection error', '', str(e))
 
-    def monitor(self, job: JobDescription):
+    def monitor(self, job: JobDescription, *args):
         try:
-            tmp_file = str((self.tmp_path / f'{job.id}.txt').absolute())
+            tmp_file = f'{self._tmp_path_str}/{job.id}.txt'
             self.client.monitor(job.id, tmp_file)
         except Exception as e:
             rumps.notification('Monitor error', '', str(e))
 
-    def remote_debug(self, job: JobDescription):
+    def remote_debug(self, job: JobDescription, *args):
         try:
-            with Settings(self.settings_path) as settings:
-                response = Windows.port(settings['port'])
-                settings['port'] = str(response.text)
+            response = Windows.port(self._settings['port'])
+            self._settings['port'] = str(response.text)
+            self._settings_dirty = True
 
-                if response.clicked:
-                    try:
-                        local_port = int(response.text)
-                    except ValueError:
-                        raise ValueError(f'Bad local port: {response.text}')
+            if response.clicked:
+                try:
+                    local_port = int(response.text)
+                except ValueError:
+                    raise ValueError(f'Bad local port: {response.text}')
 
-                    self.client.remote_debug(job.id, local_port)
+                self.client.remote_debug(job.id, local_port)
         except Exception as e:
             rumps.notification('Remote debug error', '', str(e))
 
-    def kill_job(self, job: JobDescription):
+    def kill_job(self, job: JobDescription, *args):
         response = Windows.kill_job()
 
         if response.clicked:
-            try:
-                self.client.job_kill(job.id)
-                del self.menu[job.id]
-                self.set_active_mode()
-            except Exception as e:
-                rumps.notification('Failed to kill the job', '', str(e))
+            self.run_in_background(partial(self.client.job_kill, job.id),
+                                   'Failed to kill the job',
+                                   partial(self.on_job_killed, job))
+
+    def on_job_killed(self, job: JobDescription):
+        self.remove_job_item(job.id)
+        self.set_active_mode()
 
     def create_preset(self, *args):
         preset = {
@@ -143,10 +254,10 @@ class NeuroxApp(rumps.App):
             if response.clicked:
                 preset['job_params'] = response.text
                 self.update_preset(preset)
-                self.render_menu()
+                self._schedule_render()
                 return
 
-    def submit_preset(self, preset: dict):
+    def submit_preset(self, preset: dict, *args):
         response = Windows.job_description(preset['name'])
 
         if response.clicked:
@@ -158,175 +269,349 @@ class NeuroxApp(rumps.App):
                 rumps.notification('Failed to create new job', '', str(e))
 
     def update_preset(self, preset: dict, remove: bool = False):
-        with Settings(self.settings_path) as settings:
-            new_presets = []
-            is_found = False
-
-            for it in settings['presets']:
-                if it['id'] == preset['id']:
-                    is_found = True
-                    if not remove:
-                        new_presets.append(preset)
-                else:
-                    new_presets.append(it)
+        if remove:
+            if self._presets_by_id.pop(preset['id'], None) is not None:
+                self._presets_order.remove(preset['id'])
+        else:
+            if preset['id'] not in self._presets_by_id:
+                self._presets_order.append(preset['id'])
 
-            if not is_found and not remove:
-                new_presets.append(preset)
+            self._presets_by_id[preset['id']] = preset
 
-            settings['presets'] = new_presets
+        self._settings_dirty = True
+        self._menu_dirty = True
 
-    def rename_preset(self, preset: dict):
+    def rename_preset(self, preset: dict, *args):
         response = Windows.preset_name(preset['name'], 'Save')
 
         if response.clicked:
             preset['name'] = response.text
             self.update_preset(preset)
-            self.render_menu()
+            self._schedule_render()
 
-    def change_preset(self, preset: dict):
+    def change_preset(self, preset: dict, *args):
         response = Windows.preset_params(preset['job_params'], 'Save', 'Cancel')
 
         if response.clicked:
             preset['job_params'] = response.text
             self.update_preset(preset)
-            self.render_menu()
+            self._schedule_render()
 
-    def remove_preset(self, preset: dict):
+    def remove_preset(self, preset: dict, *args):
         response = Windows.remove_preset()
 
         if response.clicked:
             self.update_preset(preset, remove=True)
-            self.render_menu()
+            self._schedule_render()
 
-    def update_client(self):
-        with Settings(self.settings_path) as settings:
-            self.client.update_username(settings['username'])
-            self.client.update_auth(settings['auth'])
-            self.client.update_url(settings['url'])
-            self.client.update_rsa_path(settings['rsa_path'])
+    def apply_settings(self, fields: Iterable[str]):
+        # Push the given settings to the client, e.g. `username` is passed to `NeuroxClient.update_username`
+        for field in fields:
+            getattr(self.client, f'update_{field}')(self._settings[field])
 
-    def settings(self, window: Callable, field: str):
-        with Settings(self.settings_path) as settings:
-            response = window(settings[field])
+    def settings(self, window: Callable, field: str, *args):
+        response = window(self._settings[field])
 
-            if response.clicked:
-                settings[field] = response.text
+        if response.clicked and response.text != self._settings[field]:
+            self._settings[field] = response.text
+            self._settings_dirty = True
+            self.apply_settings([field])
 
-        self.update_client()
+    @staticmethod
+    def copy_to_clipboard(text: str, *args):
+        pyperclip.copy(text)
+
+    @staticmethod
+    def open_url(url: str, *args):
+        webbrowser.open(url)
 
     def render_job_item(self, job: JobDescription):
         job_name = job.description if job.description else job.id
-        item = rumps.MenuItem(job_name, lambda *args, **kwargs: pyperclip.copy(job.id))
+        item = rumps.MenuItem(job_name, partial(self.copy_to_clipboard, job.id))
         item.set_icon(get_icon(job.status), dimensions=(12, 12))
 
-        item.add(rumps.MenuItem(f'Id: {job.id}'))
-        item.add(rumps.MenuItem(f'Status: {job.status}'))
-        item.add(rumps.MenuItem(f'Image: {job.image}'))
-        item.add(rumps.MenuItem(f'CPU: {job.resources.cpu}'))
+        subitems = [
+            rumps.MenuItem(f'Id: {job.id}'),
+            rumps.MenuItem(f'Status: {job.status}'),
+            rumps.MenuItem(f'Image: {job.image}'),
+            rumps.MenuItem(f'CPU: {job.resources.cpu}')
+        ]
 
         if job.resources.gpu:
-            item.add(rumps.MenuItem(f'GPU: {int(job.resources.gpu)} ({job.resources.gpu_model})'))
+            subitems.append(rumps.MenuItem(f'GPU: {int(job.resources.gpu)} ({job.resources.gpu_model})'))
 
-        item.add(rumps.MenuItem(f'Memory: {job.resources.memory}'))
+        subitems.append(rumps.MenuItem(f'Memory: {job.resources.memory}'))
 
         if job.resources.shm:
-            item.add(rumps.MenuItem('Extshm: true'))
-
-        item.add(rumps.separator)
+            subitems.append(rumps.MenuItem('Extshm: true'))
 
-        item.add(rumps.MenuItem('Monitor', lambda _: self.monitor(job)))
+        subitems.append(rumps.separator)
+        subitems.append(rumps.MenuItem('Monitor', partial(self.monitor, job)))
 
         if job.ssh:
-            item.add(rumps.MenuItem('Remote debug...', lambda _: self.remote_debug(job)))
+            subitems.append(rumps.MenuItem('Remote debug...', partial(self.remote_debug, job)))
 
         if job.url:
-            item.add(rumps.MenuItem('Open link', lambda _: webbrowser.open(str(job.url))))
+            subitems.append(rumps.MenuItem('Open link', partial(self.open_url, str(job.url))))
 
         if job.ssh:
-            item.add(rumps.MenuItem('Connect SSH', lambda _: self.connect_ssh(job)))
+            subitems.append(rumps.MenuItem('Connect SSH', partial(self.connect_ssh, job)))
 
-        item.add(rumps.MenuItem('Kill', lambda _: self.kill_job(job)))
+        subitems.append(rumps.MenuItem('Kill', partial(self.kill_job, job)))
+        item.update(subitems)
         return item
 
     def render_preset_item(self, preset) -> rumps.MenuItem:
         item = rumps.MenuItem(preset['name'])
-        item.add(rumps.MenuItem('Submit...', lambda _: self.submit_preset(preset)))
-        item.add(rumps.MenuItem('Rename...', lambda _: self.rename_preset(preset)))
-        item.add(rumps.MenuItem('Change job...', lambda _: self.change_preset(preset)))
-        item.add(rumps.MenuItem('Remove', lambda _: self.remove_preset(preset)))
-        return item
-
-    def render_presets_item(self) -> rumps.MenuItem:
-        item = rumps.MenuItem('Presets')
-
-        with Settings(self.settings_path) as settings:
-            presets = settings['presets']
-
-        for preset in presets:
-            item.add(self.render_preset_item(preset))
-
-        if len(presets) == 0:
-            item.add(rumps.MenuItem('No presets'))
-
-        item.add(rumps.separator)
-        item.add(rumps.MenuItem('Create preset...', self.create_preset))
+        item.update([
+            rumps.MenuItem('Submit...', partial(self.submit_preset, preset)),
+            rumps.MenuItem('Rename...', partial(self.rename_preset, preset)),
+            rumps.MenuItem('Change job...', partial(self.change_preset, preset)),
+            rumps.MenuItem('Remove', partial(self.remove_preset, preset))
+        ])
         return item
 
     def render_settings_item(self) -> rumps.MenuItem:
         item = rumps.MenuItem('Settings')
-        item.add(rumps.MenuItem('Username...', lambda _: self.settings(Windows.username, 'username')))
-        item.add(rumps.MenuItem('Token...', lambda _: self.settings(Windows.auth, 'auth')))
-        item.add(rumps.MenuItem('API URL...', lambda _: self.settings(Windows.url, 'url')))
-        item.add(rumps.MenuItem('RSA key path...', lambda _: self.settings(Windows.rsa_path, 'rsa_path')))
+        item.update([
+            rumps.MenuItem('Username...', partial(self.settings, Windows.username, 'username')),
+            rumps.MenuItem('Token...', partial(self.settings, Windows.auth, 'auth')),
+            rumps.MenuItem('API URL...', partial(self.settings, Windows.url, 'url')),
+            rumps.MenuItem('RSA key path...', partial(self.settings, Windows.rsa_path, 'rsa_path'))
+        ])
         return item
 
-    def render_menu(self):
+    def _schedule_render(self):
+        # Render right away if the menu has been idle, otherwise coalesce with the next render tick
+        if time.monotonic() - self._last_render_ts >= self.RENDER_DELAY:
+            self.render_menu()
+        else:
+            self._pending_render = True
+
+    @rumps.timer(RENDER_DELAY)
+    def refresh(self, timer: rumps.Timer):
+        self.collect_updates()
+        self.collect_actions()
+
+        if self._pending_render:
+            self.render_menu()
+
+    def render_skeleton(self):
         quit_button = self.menu.get('Quit')
         self.menu.clear()
 
-        self.menu.add(rumps.MenuItem(self.ABOUT, lambda _: webbrowser.open(self.GITHUB_ULR)))
-        self.menu.add(self.render_settings_item())
+        # Flush the settings to disk before quitting
+        if quit_button is not None:
+            quit_button.set_callback(self.quit_application)
+
+        self.menu.add(self._about_item)
+        self.menu.add(self._settings_item)
         self.menu.add(rumps.separator)
 
+        # Jobs are spliced in between the settings and the tail of the menu
+        self._menu_tail = [
+            ('separator_jobs', rumps.separator),
+            ('Create job...', self._create_job_item),
+            ('Presets', self._presets_item),
+            ('separator_quit', rumps.separator),
+            ('Quit', quit_button)
+        ]
+
+    @staticmethod
+    def splice_items(menu: rumps.MenuItem,
+                     rendered: Dict[str, rumps.MenuItem],
+                     items: Dict[str, rumps.MenuItem],
+                     tail: List[Tuple[str, Any]]):
+        # Remove items that are not needed anymore or have been re-rendered
+        for key, item in list(rendered.items()):
+            if items.get(key) is not item:
+                del menu[key]
+                del rendered[key]
+
+        # The remaining items keep their relative order, so only the items after the first mismatch are re-added
+        common = 0
+        for rendered_key, key in zip(rendered, items):
+            if rendered_key != key:
+                break
+            common += 1
+
+        new_keys = list(items)[common:]
+
+        if not new_keys:
+            return
+
+        for key in list(rendered)[common:]:
+            del menu[key]
+            del rendered[key]
+
+        for key, _ in tail:
+            if key in menu:
+                del menu[key]
+
+        # Items are keyed by id rather than by title, so that items with the same title are all shown
+        for key in new_keys:
+            menu[key] = items[key]
+            rendered[key] = items[key]
+
+        for key, value in tail:
+            menu[key] = value
+
+    def remove_job_item(self, job_id: str):
+        item = self._rendered_jobs.pop(job_id, None)
+        self._job_fingerprints.pop(job_id, None)
+
+        if item is not None:
+            del self.menu[job_id]
+
+        # Show the placeholder right away instead of waiting for the client to report the change
+        if not self._rendered_jobs:
+            self.splice_items(self.menu, self._rendered_jobs, {self.NO_ACTIVE_JOBS: self._no_jobs_item}, self._menu_tail)
+
+    def job_created_at(self, job: JobDescription) -> datetime:
+        # Creation time never changes, so it is parsed once per job
+        created_at = self._created_at_cache.get(job.id)
+
+        if created_at is None:
+            created_at = self._created_at_cache[job.id] = datetime.fromisoformat(job.history.created_at)
+
+        return created_at
+
+    def render_jobs(self):
+        jobs = self.client.get_active_jobs()
+
+        # Nothing to patch if none of the shown job properties have changed
+        jobs_hash = tuple((job.id, job.status, job.ssh, bool(job.url)) for job in jobs)
+
+        if jobs_hash == self._jobs_hash:
+            return
+
+        self._jobs_hash = jobs_hash
+
         # Active jobs sorted by created time
-        jobs = sorted(self.client.get_active_jobs(), key=lambda it: datetime.fromisoformat(it.history.created_at))
+        jobs = sorted(jobs, key=self.job_created_at)
+        items = dict()
 
-        if jobs:
-            for job in jobs:
-                self.menu.add(self.render_job_item(job))
-        else:
-            self.menu.add(rumps.MenuItem('No active jobs'))
+        for job in jobs:
+            item = self._rendered_jobs.get(job.id)
+            fingerprint = (job.status, job.ssh, job.url, job.image)
 
-        self.menu.add(rumps.separator)
-        self.menu.add(rumps.MenuItem('Create job...', self.create_job))
-        self.menu.add(self.render_presets_item())
-        self.menu.add(rumps.separator)
-        self.menu.add(quit_button)
+            if item is None or self._job_fingerprints.get(job.id) != fingerprint:
+                item = self.render_job_item(job)
+                self._job_fingerprints[job.id] = fingerprint
+
+            items[job.id] = item
+
+        for job_id in set(self._job_fingerprints) - set(items):
+            del self._job_fingerprints[job_id]
+
+        for job_id in set(self._created_at_cache) - set(items):
+            del self._created_at_cache[job_id]
+
+        if not items:
+            items[self.NO_ACTIVE_JOBS] = self._no_jobs_item
+
+        self.splice_items(self.menu, self._rendered_jobs, items, self._menu_tail)
+
+    def render_presets(self):
+        items = dict()
+
+        for preset in map(self._presets_by_id.get, self._presets_order):
+            item = self._rendered_presets.get(preset['id'])
+            fingerprint = (preset['name'], preset['job_params'])
+
+            if item is None or self._preset_fingerprints.get(preset['id']) != fingerprint:
+                item = self.render_preset_item(preset)
+                self._preset_fingerprints[preset['id']] = fingerprint
+
+            items[preset['id']] = item
+
+        for preset_id in set(self._preset_fingerprints) - set(items):
+            del self._preset_fingerprints[preset_id]
+
+        if not items:
+            items[self.NO_PRESETS] = self._no_presets_item
+
+        self.splice_items(self._presets_item, self._rendered_presets, items, self._presets_tail)
+
+    def render_menu(self):
+        self._menu_dirty = False
+        self._pending_render = False
+        self._last_render_ts = time.monotonic()
+
+        if not self._menu_tail:
+            self.render_skeleton()
+
+        self.render_jobs()
+        self.render_presets()
+
+    def show_updates(self, updates: List[StatusUpdate or NewJobUpdate]):
+        now = time.monotonic()
+
+        # Group updates of the same kind, so that a burst of updates is shown as a few notifications
+        groups = dict()
 
-    @staticmethod
-    def show_updates(updates: List[StatusUpdate or NewJobUpdate]):
         for update in updates:
-            if isinstance(update, StatusUpdate):
-                reason = f' ({update.reason})' if update.reason else ''
-                rumps.notification('Job status has changed', update.job_id, f'New status: {update.status}{reason}')
+            key = (update.job_id, update.status, update.reason or '')
+
+            # Skip updates that have just been shown
+            if key in self._recent_notifications:
+                self._recent_notifications.move_to_end(key)
 
-            if isinstance(update, NewJobUpdate):
-                reason = f' ({update.reason})' if update.reason else ''
-                rumps.notification('New job is created', update.job_id, f'Status: {update.status}{reason}')
+                if now - self._recent_notifications[key] < self.NOTIFICATION_WINDOW:
+                    continue
+
+            self._recent_notifications[key] = now
+
+            if len(self._recent_notifications) > self.MAX_RECENT_NOTIFICATIONS:
+                self._recent_notifications.popitem(last=False)
+
+            groups.setdefault((type(update), update.status), []).append(update)
+
+        for (update_type, status), group in groups.items():
+            if len(group) > self.MAX_GROUP_NOTIFICATIONS:
+                jobs = ', '.join(it.name for it in group)
+
+                if update_type is StatusUpdate:
+                    rumps.notification(f'{len(group)} jobs changed status', '', f'New status: {status} ({jobs})')
+
+                if update_type is NewJobUpdate:
+                    rumps.notification(f'{len(group)} new jobs are created', '', f'Status: {status} ({jobs})')
+
+                continue
+
+            for update in group:
+                if isinstance(update, StatusUpdate):
+                    reason = f' ({update.reason})' if update.reason else ''
+                    rumps.notification('Job status has changed', update.name, f'New status: {update.status}{reason}')
+
+                if isinstance(update, NewJobUpdate):
+                    reason = f' ({update.reason})' if update.reason else ''
+                    rumps.notification('New job is created', update.name, f'Status: {update.status}{reason}')
 
     @rumps.timer(UPDATE_DELAY)
     def update(self, timer: rumps.Timer):
+        self.save_settings()
         self.iteration += 1
 
-        if self.iteration < self.update_cycle_len:
+        if self.iteration < self.update_cycle_len or self._update_future is not None:
             return
 
         self.iteration = 0
         self.update_cycle_len = min(2 * self.update_cycle_len, self.MAX_UPDATE_CYCLE_LEN)
+        self._update_future = self._executor.submit(self.client.update)
+
+    def collect_updates(self):
+        if self._update_future is None or not self._update_future.done():
+            return
+
+        future, self._update_future = self._update_future, None
 
         try:
-            updates = self.client.update()
+            updates = future.result()
             self.show_updates(updates)
+
+            # The first successful poll fills the jobs without reporting updates, so always re-check the menu
+            self._menu_dirty = True
         except ValueError as e:
             rumps.notification('Failed to get updates', '', str(e))
         except AuthenticationError:
@@ -335,4 +620,5 @@ class NeuroxApp(rumps.App):
             # Ignore Internet connection problems
             pass
 
-        self.render_menu()
+        if self._menu_dirty:
+            self._schedule_render()
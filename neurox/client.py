@@ -3,7 +3,7 @@ import shlex
 import subprocess
 from collections import namedtuple
 from functools import wraps
-from typing import List, Any, Callable
+from typing import List, Any, Callable, Optional, Tuple
 
 import aiofiles as aiof
 import aiohttp
@@ -16,8 +16,8 @@ from neuromation.clientv2.jobs import JobDescription, JobStatus
 
 from neurox.ssh_utils import connect_ssh
 
-StatusUpdate = namedtuple('StatusUpdate', ['job_id', 'status', 'reason'])
-NewJobUpdate = namedtuple('NewJobUpdate', ['job_id', 'status', 'reason'])
+StatusUpdate = namedtuple('StatusUpdate', ['job_id', 'name', 'status', 'reason'])
+NewJobUpdate = namedtuple('NewJobUpdate', ['job_id', 'name', 'status', 'reason'])
 
 
 def sync_wait(future: Callable) -> Callable:
@@ -37,6 +37,10 @@ class NeuroxClient:
         self._url = None
         self._rsa_path = None
 
+        # API client reused by `job_list` and `job_kill`, so they must be called from the same event loop
+        self._api: Optional[ClientV2] = None
+        self._api_config: Optional[Tuple[str, str]] = None
+
     def update_username(self, username: str):
         self._username = username
 
@@ -49,6 +53,27 @@ class NeuroxClient:
     def update_rsa_path(self, rsa_path: str):
         self._rsa_path = rsa_path
 
+    async def _get_api(self) -> ClientV2:
+        config = (self._url, self._auth)
+
+        # Open a new session only when the connection settings have changed
+        if self._api is not None and self._api_config != config:
+            await self._api.close()
+            self._api = None
+
+        if self._api is None:
+            self._api = ClientV2(self._url, self._auth)
+            self._api_config = config
+
+        return self._api
+
+    @sync_wait
+    async def close(self):
+        if self._api is not None:
+            await self._api.close()
+            self._api = None
+            self._api_config = None
+
     def update(self) -> List[StatusUpdate or NewJobUpdate]:
         updates = []
         jobs = {it.id: it for it in self.job_list()}
@@ -68,7 +93,7 @@ class NeuroxClient:
                 self._jobs[job_id] = new_job
                 name = new_job.description if new_job.description else job_id
                 reason = new_job.history.reason if new_job.status == JobStatus.FAILED else None
-                updates.append(StatusUpdate(name, new_job.status, reason))
+                updates.append(StatusUpdate(job_id, name, new_job.status, reason))
 
         # update new job statuses
         for job_id, new_job in jobs.items():
@@ -78,12 +103,13 @@ class NeuroxClient:
             self._jobs[job_id] = new_job
             name = new_job.description if new_job.description else job_id
             reason = new_job.history.reason if new_job.status == JobStatus.FAILED else None
-            updates.append(NewJobUpdate(name, new_job.status, reason))
+            updates.append(NewJobUpdate(job_id, name, new_job.status, reason))
 
         return updates
 
     def get_active_jobs(self) -> List[JobDescription]:
-        jobs = self._jobs.values() if self._jobs else []
+        # Copy the jobs first, because they are updated from a background thread
+        jobs = list(self._jobs.values()) if self._jobs else []
         return list(filter(lambda it: it.status in [JobStatus.PENDING, JobStatus.RUNNING], jobs))
 
     @sync_wait
@@ -94,8 +120,8 @@ class NeuroxClient:
         if not self._auth:
             raise ValueError('Specify neuromation API token!')
 
-        async with ClientV2(self._url, self._auth) as api:
-            await api.jobs.kill(job_id)
+        api = await self._get_api()
+        await api.jobs.kill(job_id)
 
     @sync_wait
     async def job_list(self) -> List[JobDescription]:
@@ -105,8 +131,8 @@ class NeuroxClient:
         if not self._auth:
             raise ValueError('Specify neuromation API token!')
 
-        async with ClientV2(self._url, self._auth) as api:
-            return await api.jobs.list()
+        api = await self._get_api()
+        return await api.jobs.list()
 
     @sync_wait
     async def monitor(self, job_id: str, tmp_file: str) -> Any:
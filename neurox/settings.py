@@ -1,4 +1,6 @@
-import json
+import os
+
+import orjson
 
 
 class Settings:
@@ -26,15 +28,20 @@ class Settings:
 
     def load(self):
         try:
-            with open(self.path) as file:
-                self.settings.update(json.load(file))
+            with open(self.path, 'rb') as file:
+                self.settings.update(orjson.loads(file.read()))
         except Exception as e:
             pass
 
     def save(self):
         try:
-            with open(self.path, 'w') as file:
-                json.dump(self.settings, file)
+            # Write to a temporary file first, so that the settings are never left half-written
+            tmp_path = f'{self.path}.tmp'
+
+            with open(tmp_path, 'wb') as file:
+                file.write(orjson.dumps(self.settings))
+
+            os.replace(tmp_path, self.path)
         except Exception as e:
             pass
 
@@ -1,8 +1,11 @@
+import asyncio
 import os
 import stat
 import sys
+from functools import lru_cache
 
 
+@lru_cache(maxsize=32)
 def get_icon(name: str) -> str:
     if getattr(sys, 'frozen', False):
         bundle = f'{sys.executable.rsplit("/", 3)[0]}/Contents/Resources/'
@@ -14,3 +17,7 @@ def get_icon(name: str) -> str:
 def make_executable(path: str):
     st = os.stat(path)
     os.chmod(path, st.st_mode | stat.S_IEXEC)
+
+
+def set_new_event_loop():
+    asyncio.set_event_loop(asyncio.new_event_loop())